@@ -2,7 +2,7 @@ import streamlit as st
 
 from playlist_logic import (
     DEFAULT_PROFILE,
-    Song,
+    RawSong,
     build_playlists,
     compute_playlist_stats,
     history_summary,
@@ -242,7 +242,7 @@ def add_song_sidebar():
         raw_tags = [t.strip() for t in tags_text.split(",")]
         tags = [t for t in raw_tags if t]
 
-        song: Song = {
+        song: RawSong = {
             "title": title,
             "artist": artist,
             "genre": genre,
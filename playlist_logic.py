@@ -1,21 +1,75 @@
-from typing import Dict, List, Optional, Tuple
+import random
+import re
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from itertools import chain
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+RawSong = Dict[str, object]
+
+@dataclass(slots=True)
+class Song:
+    """A normalized song.
+
+    Slots keep each song small; dict-style access (song["title"],
+    song.get("mood")) lets the same code handle raw song dicts too.
+    """
+
+    title: str
+    artist: str
+    genre: str
+    energy: int
+    tags: List[str]
+    mood: Optional[str] = None
+
+    def __getitem__(self, key: str) -> object:
+        if key not in _SONG_KEYS or (key == "mood" and self.mood is None):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: object) -> None:
+        if key not in _SONG_KEYS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: object) -> bool:
+        return key in _SONG_KEYS and (key != "mood" or self.mood is not None)
+
+    def get(self, key: str, default: object = None) -> object:
+        """Return the field value for key, or default if there is no such field.
+
+        An unset mood counts as missing, like a raw song dict without that key.
+        """
+        if key not in _SONG_KEYS or (key == "mood" and self.mood is None):
+            return default
+        return getattr(self, key)
+
+
+# Song fields reachable through dict-style access
+_SONG_KEYS = frozenset(f.name for f in fields(Song) if f.init)
+
 
-Song = Dict[str, object]
 PlaylistMap = Dict[str, List[Song]]
 
-DEFAULT_PROFILE = {
+# Read-only so it can be shared without defensive copies; callers that need
+# an editable profile build one with dict(DEFAULT_PROFILE) or {**DEFAULT_PROFILE, ...}
+DEFAULT_PROFILE = MappingProxyType({
     "name": "Default",
     "hype_min_energy": 7,
     "chill_max_energy": 3,
     "favorite_genre": "rock",
     "include_mixed": True,
-}
+})
 
 # Genre keywords that push a song toward Hype
-HYPE_GENRE_KEYWORDS = ["rock", "punk", "party"]
+HYPE_GENRE_KEYWORDS = ("rock", "punk", "party")
 
 # Title keywords that push a song toward Chill (matched case-insensitively)
-CHILL_TITLE_KEYWORDS = ["lofi", "ambient", "sleep"]
+CHILL_TITLE_KEYWORDS = ("lofi", "ambient", "sleep")
+
+# All chill keywords as one alternation so a title is scanned once, not per keyword
+_CHILL_TITLE_RE = re.compile("|".join(map(re.escape, CHILL_TITLE_KEYWORDS)))
 
 
 def normalize_title(title: str) -> str:
@@ -35,11 +89,18 @@ def normalize_artist(artist: str) -> str:
 
 def normalize_genre(genre: str) -> str:
     """Normalize a genre name for comparisons."""
-    return genre.lower().strip()
+    # Strip first so lower() only copies the characters that are kept
+    return genre.strip().lower()
+
 
+def _fold_case(text: str) -> str:
+    """Return text folded for case-insensitive matching."""
+    # lower() is enough for ASCII; only pay for Unicode casefold() when needed
+    return text.lower() if text.isascii() else text.casefold()
 
-def normalize_song(raw: Song) -> Song:
-    """Return a normalized song dict with expected keys."""
+
+def normalize_song(raw: RawSong) -> Song:
+    """Return a normalized Song built from a raw song dict."""
     title = normalize_title(str(raw.get("title", "")))
     artist = normalize_artist(str(raw.get("artist", "")))
     genre = normalize_genre(str(raw.get("genre", "")))
@@ -55,54 +116,108 @@ def normalize_song(raw: Song) -> Song:
     if isinstance(tags, str):
         tags = [tags]
 
-    return {
-        "title": title,
-        "artist": artist,
-        "genre": genre,
-        "energy": energy,
-        "tags": tags,
-    }
+    return Song(
+        title=title,
+        artist=artist,
+        genre=genre,
+        energy=energy,
+        tags=tags,
+    )
 
 
-def classify_song(song: Song, profile: Dict[str, object]) -> str:
-    """Return a mood label given a song and user profile."""
-    energy = song.get("energy", 0)
-    genre = song.get("genre", "")
-    title = song.get("title", "")
+def _resolve_profile(profile: Mapping[str, object]) -> Tuple[str, int, int]:
+    """Return favorite genre, hype min and chill max energy, filling in defaults."""
+    return (
+        profile.get("favorite_genre", DEFAULT_PROFILE["favorite_genre"]),
+        profile.get("hype_min_energy", DEFAULT_PROFILE["hype_min_energy"]),
+        profile.get("chill_max_energy", DEFAULT_PROFILE["chill_max_energy"]),
+    )
+
 
-    hype_min_energy = profile.get("hype_min_energy", 7)
-    chill_max_energy = profile.get("chill_max_energy", 3)
-    favorite_genre = profile.get("favorite_genre", "")
+def classify_song(song: Union[Song, RawSong], profile: Mapping[str, object]) -> str:
+    """Return a mood label given a song and user profile.
 
-    # Three independent reasons a song is Hype — each checked against its own field
-    is_favorite_genre = genre == favorite_genre
-    is_high_energy = energy >= hype_min_energy
-    genre_has_hype_keyword = any(k in genre for k in HYPE_GENRE_KEYWORDS)
+    The profile may be partial; missing keys fall back to DEFAULT_PROFILE, so
+    callers can pass a small overrides dict or a ChainMap without copying.
+    """
+    return _classify_resolved(song, *_resolve_profile(profile))
 
-    # Two independent reasons a song is Chill
-    is_low_energy = energy <= chill_max_energy
-    title_has_chill_keyword = any(k in title.lower() for k in CHILL_TITLE_KEYWORDS)
 
-    if is_favorite_genre or is_high_energy or genre_has_hype_keyword:
+def _classify_resolved(
+    song: Union[Song, RawSong],
+    favorite_genre: str,
+    hype_min_energy: int,
+    chill_max_energy: int,
+) -> str:
+    """Return a mood label given a song and already-resolved profile thresholds."""
+    energy = song.get("energy", 0)
+    genre = song.get("genre", "")
+    title_lc = _fold_case(song.get("title", ""))
+
+    # The regex scan runs in C; the title then only contributes a flag to the
+    # cache key, so the decision tree runs once per distinct key
+    return _classify_key(
+        genre,
+        energy,
+        _CHILL_TITLE_RE.search(title_lc) is not None,
+        favorite_genre,
+        hype_min_energy,
+        chill_max_energy,
+    )
+
+
+@lru_cache(maxsize=4096)
+def _classify_key(
+    genre: str,
+    energy: int,
+    title_has_chill_keyword: bool,
+    favorite_genre: str,
+    hype_min_energy: int,
+    chill_max_energy: int,
+) -> str:
+    """Return a mood label from already-extracted song and profile fields.
+
+    The title only contributes whether it has a chill keyword, so the cache
+    key space stays small (genres x energies x 2) even for very large catalogs
+    with mostly unique titles.
+    """
+    # Cheapest tests first: integer bounds, then genre equality, then
+    # keyword scans. All Hype reasons are still checked before any Chill one.
+    if energy >= hype_min_energy:
+        return "Hype"
+    if genre == favorite_genre:
         return "Hype"
-    if is_low_energy or title_has_chill_keyword:
+    if any(k in genre for k in HYPE_GENRE_KEYWORDS):
+        return "Hype"
+
+    if energy <= chill_max_energy:
+        return "Chill"
+    if title_has_chill_keyword:
         return "Chill"
     return "Mixed"
 
 
-def build_playlists(songs: List[Song], profile: Dict[str, object]) -> PlaylistMap:
+def build_playlists(songs: List[RawSong], profile: Mapping[str, object]) -> PlaylistMap:
     """Group songs into playlists based on mood and profile."""
+    normalized = [normalize_song(song) for song in songs]
+
+    # Resolve the profile once for the whole batch, not once per song
+    favorite_genre, hype_min_energy, chill_max_energy = _resolve_profile(profile)
+    moods = [
+        _classify_resolved(song, favorite_genre, hype_min_energy, chill_max_energy)
+        for song in normalized
+    ]
+
+    # One pass over the mood column both tags each song and buckets it,
+    # instead of a tagging pass plus one filtering pass per playlist
     playlists: PlaylistMap = {
         "Hype": [],
         "Chill": [],
         "Mixed": [],
     }
-
-    for song in songs:
-        normalized = normalize_song(song)
-        mood = classify_song(normalized, profile)
-        normalized["mood"] = mood
-        playlists[mood].append(normalized)
+    for song, mood in zip(normalized, moods):
+        song.mood = mood
+        playlists[mood].append(song)
 
     return playlists
 
@@ -118,31 +233,27 @@ def merge_playlists(a: PlaylistMap, b: PlaylistMap) -> PlaylistMap:
 
 def compute_playlist_stats(playlists: PlaylistMap) -> Dict[str, object]:
     """Compute statistics across all playlists."""
-    all_songs: List[Song] = []
-    for songs in playlists.values():
-        all_songs.extend(songs)
-
-    hype = playlists.get("Hype", [])
-    chill = playlists.get("Chill", [])
-    mixed = playlists.get("Mixed", [])
+    # Counts come straight from list lengths; only energy needs a pass over songs
+    counts = {mood: len(songs) for mood, songs in playlists.items()}
 
     # Fix: total should be all songs, not just hype, so hype_ratio is meaningful
-    total = len(all_songs)
-    hype_ratio = len(hype) / total if total > 0 else 0.0
+    total = sum(counts.values())
+    hype_count = counts.get("Hype", 0)
+    hype_ratio = hype_count / total if total > 0 else 0.0
 
-    avg_energy = 0.0
-    if all_songs:
-        # Fix: avg_energy should average all songs, not just hype songs
-        total_energy = sum(song.get("energy", 0) for song in all_songs)
-        avg_energy = total_energy / len(all_songs)
+    # Fix: avg_energy should average all songs, not just hype songs
+    total_energy = sum(
+        song.get("energy", 0) for songs in playlists.values() for song in songs
+    )
+    avg_energy = total_energy / total if total > 0 else 0.0
 
-    top_artist, top_count = most_common_artist(all_songs)
+    top_artist, top_count = most_common_artist(chain.from_iterable(playlists.values()))
 
     return {
-        "total_songs": len(all_songs),
-        "hype_count": len(hype),
-        "chill_count": len(chill),
-        "mixed_count": len(mixed),
+        "total_songs": total,
+        "hype_count": hype_count,
+        "chill_count": counts.get("Chill", 0),
+        "mixed_count": counts.get("Mixed", 0),
         "hype_ratio": hype_ratio,
         "avg_energy": avg_energy,
         "top_artist": top_artist,
@@ -150,7 +261,7 @@ def compute_playlist_stats(playlists: PlaylistMap) -> Dict[str, object]:
     }
 
 
-def most_common_artist(songs: List[Song]) -> Tuple[str, int]:
+def most_common_artist(songs: Iterable[Union[Song, RawSong]]) -> Tuple[str, int]:
     """Return the most common artist and count."""
     counts: Dict[str, int] = {}
     for song in songs:
@@ -167,24 +278,18 @@ def most_common_artist(songs: List[Song]) -> Tuple[str, int]:
 
 
 def search_songs(
-    songs: List[Song],
+    songs: List[Union[Song, RawSong]],
     query: str,
     field: str = "artist",
-) -> List[Song]:
+) -> List[Union[Song, RawSong]]:
     """Return songs matching the query on a given field."""
-    if not query:
+    # Blank queries match everything; return the input as-is rather than copying it
+    q = _fold_case(query.strip()) if query else ""
+    if not q:
         return songs
 
-    q = query.lower().strip()
-    filtered: List[Song] = []
-
-    for song in songs:
-        value = str(song.get(field, "")).lower()
-        # Fix: query should be checked as substring of field value, not the reverse
-        if value and q in value:
-            filtered.append(song)
-
-    return filtered
+    # Fix: query should be checked as substring of field value, not the reverse
+    return [song for song in songs if q in _fold_case(str(song.get(field, "")))]
 
 
 def lucky_pick(
@@ -197,15 +302,20 @@ def lucky_pick(
     elif mode == "chill":
         songs = playlists.get("Chill", [])
     else:
-        songs = playlists.get("Hype", []) + playlists.get("Chill", [])
+        # Draw one index across both lists instead of concatenating them per pick
+        hype = playlists.get("Hype", [])
+        chill = playlists.get("Chill", [])
+        total = len(hype) + len(chill)
+        if total == 0:
+            return None
+        index = random.randrange(total)
+        return hype[index] if index < len(hype) else chill[index - len(hype)]
 
     return random_choice_or_none(songs)
 
 
 def random_choice_or_none(songs: List[Song]) -> Optional[Song]:
     """Return a random song or None."""
-    import random
-
     # Fix: random.choice raises IndexError on empty list; return None instead
     if not songs:
         return None